@@ -494,16 +494,19 @@ MIDDLEWARE = (
 
 AUTHENTICATION_BACKENDS = list()
 
-PASSWORD_HASHERS = (
-    "django.contrib.auth.hashers.PBKDF2PasswordHasher",
-    "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
-    "django.contrib.auth.hashers.BCryptPasswordHasher",
-    "django.contrib.auth.hashers.SHA1PasswordHasher",
-    "django.contrib.auth.hashers.MD5PasswordHasher",
-    "django.contrib.auth.hashers.CryptPasswordHasher",
-    "hashers_passlib.md5_crypt",
-    "hashers_passlib.des_crypt",
-    "hashers_passlib.bsdi_crypt",
+set_option(
+    "PASSWORD_HASHERS",
+    (
+        "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+        "django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher",
+        "django.contrib.auth.hashers.BCryptPasswordHasher",
+        "django.contrib.auth.hashers.SHA1PasswordHasher",
+        "django.contrib.auth.hashers.MD5PasswordHasher",
+        "django.contrib.auth.hashers.CryptPasswordHasher",
+        "hashers_passlib.md5_crypt",
+        "hashers_passlib.des_crypt",
+        "hashers_passlib.bsdi_crypt",
+    ),
 )
 
 ROOT_URLCONF = "mainsite.urls"
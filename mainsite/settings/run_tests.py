@@ -16,6 +16,9 @@ RECAPTCHA_SECRET_KEY = ""
 DESKPRO_KEY = ""
 DESKPRO_URL = ""
 
+# fast password hashing, test users don't need secure hashes
+PASSWORD_HASHERS = ("django.contrib.auth.hashers.MD5PasswordHasher",)
+
 BASE_URL = "https://localhost"
 PASSWORD_RESET_URL = "localhost"
 DATABASE_ROUTERS = ["peeringdb_server.db_router.TestRouter"]
@@ -4242,11 +4242,26 @@ class Command(BaseCommand):
 
         # see if we need to create extra organizations (to fill up the
         # database)
+        #
+        # these are only there to pad the organization count, so they
+        # are bulk created - note that this skips the org_save signal
+        # so no usergroups are created for them
         extra_orgs = getattr(cls, "create_extra_orgs", 0)
-        i = 0
-        while i < extra_orgs:
-            cls.create_entity(Organization, prefix="r_%d" % i, status="ok")
-            i += 1
+        if extra_orgs:
+            names = [f"API Test:ORG:R_{i}:ok" for i in range(extra_orgs)]
+            existing = set(
+                Organization.objects.filter(name__in=names).values_list(
+                    "name", flat=True
+                )
+            )
+            Organization.objects.bulk_create(
+                [
+                    Organization(**TestJSON.make_data_org(name=name, status="ok"))
+                    for name in names
+                    if name not in existing
+                ],
+                batch_size=100,
+            )
 
         # create API test organization (read & write)
 
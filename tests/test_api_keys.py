@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 
@@ -5,8 +6,9 @@ import pytest
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.test import TestCase
+from django.utils.functional import cached_property
 from django_grainy.models import GroupPermission
-from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.test import APIClient
 from twentyc.rpc.client import PermissionDeniedException, RestClient
 
 import peeringdb_server.inet as pdbinet
@@ -15,22 +17,28 @@ import peeringdb_server.models as models
 
 from .util import reset_group_ids
 
+try:
+    import orjson as json_parser
+except ImportError:
+    json_parser = json
+
 RdapLookup_get_asn = pdbinet.RdapLookup.get_asn
 
 
-def setup_module(module):
+# RDAP LOOKUP OVERRIDE
+# Since we are working with fake ASNs throughout the api tests
+# we need to make sure the RdapLookup client can fake results
+# for us
 
-    # RDAP LOOKUP OVERRIDE
-    # Since we are working with fake ASNs throughout the api tests
-    # we need to make sure the RdapLookup client can fake results
-    # for us
+# These ASNs will be seen as valid and a prepared json object
+# will be returned for them (data/api/rdap_override.json)
+#
+# ALL ASNs outside of this range will raise a RdapNotFoundError
+ASN_RANGE_OVERRIDE = frozenset(range(9000000, 9000999))
 
-    # These ASNs will be seen as valid and a prepared json object
-    # will be returned for them (data/api/rdap_override.json)
-    #
-    # ALL ASNs outside of this range will raise a RdapNotFoundError
-    ASN_RANGE_OVERRIDE = list(range(9000000, 9000999))
 
+@pytest.fixture(scope="module", autouse=True)
+def rdap_override():
     with open(
         os.path.join(os.path.dirname(__file__), "data", "api", "rdap_override.json"),
     ) as fh:
@@ -45,9 +53,7 @@ def setup_module(module):
             raise pdbinet.RdapNotFoundError()
 
     pdbinet.RdapLookup.get_asn = get_asn
-
-
-def teardown_module(module):
+    yield
     pdbinet.RdapLookup.get_asn = RdapLookup_get_asn
 
 
@@ -61,9 +67,9 @@ class DummyResponse:
         self.content = content
         self.headers = headers
 
-    @property
+    @cached_property
     def data(self):
-        return json.loads(self.content)
+        return json_parser.loads(self.content)
 
     def read(self, *args, **kwargs):
         return self.content
@@ -81,23 +87,35 @@ class DummyRestClientWithKeyAuth(RestClient):
     django rest framework testing api instead
     """
 
+    # username -> User, filled by `prime`
+    _user_cache = {}
+
+    @classmethod
+    def prime(cls, usernames):
+        """
+        Load the specified users with a single query so that
+        client instantiation does not need to look them up
+        """
+        cls._user_cache = models.User.objects.in_bulk(usernames, field_name="username")
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.factory = APIRequestFactory()
         self.api_client = APIClient()
         self.useragent = kwargs.get("useragent")
 
         # Set up with users
-        if self.user:
-            self.user_inst = models.User.objects.get(username=self.user)
+        username = self.user or "guest"
+        if username in self._user_cache:
+            # copy so state cached on the instance does not leak between tests
+            self.user_inst = copy.deepcopy(self._user_cache[username])
         else:
-            self.user_inst = models.User.objects.get(username="guest")
+            self.user_inst = models.User.objects.get(username=username)
 
         # But auth with the Key if it's provided
         if kwargs.get("key") is not None:
             self.key = kwargs.get("key")
             self.api_client.credentials(HTTP_AUTHORIZATION="Api-Key " + self.key)
-            print(f"authenticating {self.user} w key {self.key}")
+            self.log(f"authenticating {self.user} w key {self.key}")
         else:
             self.api_client.force_authenticate(self.user_inst)
 
@@ -114,7 +132,7 @@ class DummyRestClientWithKeyAuth(RestClient):
         if params:
             data.update(**params)
 
-        res = fnc(url, data, format="json", **self.api_client._credentials)
+        res = fnc(url, data, format="json")
 
         assert res.charset == "utf-8"
 
@@ -128,6 +146,23 @@ USER_ORG_ADMIN = {"user": "api_test_org_admin", "password": "89c8ec05-b897"}
 USER_ORG_MEMBER = {"user": "api_test_org_member", "password": "89c8ec05-b897"}
 
 
+def org_key_permissions(org_api_key, group_name):
+    """
+    Returns unsaved OrganizationAPIPermission objects that copy
+    the grainy permissions of the group named `group_name` to `org_api_key`
+    """
+    return [
+        models.OrganizationAPIPermission(
+            org_api_key=org_api_key,
+            namespace=perm.namespace,
+            permission=perm.permission,
+        )
+        for perm in GroupPermission.objects.filter(group__name=group_name)
+        .only("namespace", "permission")
+        .iterator(chunk_size=200)
+    ]
+
+
 class APITests(TestCase, api_test.TestJSON, api_test.Command):
     """
     API tests
@@ -161,88 +196,98 @@ class APITests(TestCase, api_test.TestJSON, api_test.Command):
         )
         guest_group.user_set.add(guest_user)
 
-        GroupPermission.objects.create(
-            group=guest_group, namespace="peeringdb.organization", permission=0x01
+        GroupPermission.objects.bulk_create(
+            [
+                GroupPermission(
+                    group=guest_group,
+                    namespace="peeringdb.organization",
+                    permission=0x01,
+                ),
+                GroupPermission(
+                    group=guest_group,
+                    namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.public",
+                    permission=0x01,
+                ),
+                GroupPermission(
+                    group=user_group,
+                    namespace="peeringdb.organization",
+                    permission=0x01,
+                ),
+                GroupPermission(
+                    group=user_group,
+                    namespace=f"peeringdb.organization.{settings.SUGGEST_ENTITY_ORG}",
+                    permission=0x04,
+                ),
+                GroupPermission(
+                    group=user_group,
+                    namespace="peeringdb.organization.*.network.*.poc_set.users",
+                    permission=0x01,
+                ),
+                GroupPermission(
+                    group=user_group,
+                    namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.public",
+                    permission=0x01,
+                ),
+                GroupPermission(
+                    group=user_group,
+                    namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.users",
+                    permission=0x01,
+                ),
+            ]
         )
 
-        GroupPermission.objects.create(
-            group=guest_group,
-            namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.public",
-            permission=0x01,
-        )
+        # prepare api test data
+        cls.prepare()
 
-        GroupPermission.objects.create(
-            group=user_group, namespace="peeringdb.organization", permission=0x01
+        # user api key
+        api_test_user = models.User.objects.get(username=USER["user"])
+        cls.api_key, cls.user_key = models.UserAPIKey.objects.create_key(
+            user=api_test_user, name="User api key"
         )
 
-        GroupPermission.objects.create(
-            group=user_group,
-            namespace=f"peeringdb.organization.{settings.SUGGEST_ENTITY_ORG}",
-            permission=0x04,
+        # rw org api key
+        rw_org = models.Organization.objects.get(name="API Test Organization RW")
+        cls.rw_api_key, cls.rw_org_key = models.OrganizationAPIKey.objects.create_key(
+            name="test key", org=rw_org, email="test@localhost"
         )
 
-        GroupPermission.objects.create(
-            group=user_group,
-            namespace="peeringdb.organization.*.network.*.poc_set.users",
-            permission=0x01,
+        # r org api key
+        r_org = models.Organization.objects.get(name="API Test Organization R")
+        cls.r_api_key, cls.r_org_key = models.OrganizationAPIKey.objects.create_key(
+            name="test key", org=r_org, email="test@localhost"
         )
 
-        GroupPermission.objects.create(
-            group=user_group,
-            namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.public",
-            permission=0x01,
+        # Transfer group permissions to org keys
+        models.OrganizationAPIPermission.objects.bulk_create(
+            org_key_permissions(cls.rw_api_key, rw_org.admin_group_name)
+            + org_key_permissions(cls.r_api_key, r_org.group_name),
+            batch_size=200,
         )
 
-        GroupPermission.objects.create(
-            group=user_group,
-            namespace="peeringdb.organization.*.internetexchange.*.ixf_ixp_member_list_url.users",
-            permission=0x01,
+        # users the rest clients authenticate as
+        cls.rest_client.prime(
+            ["guest", USER["user"], USER_ORG_ADMIN["user"], USER_ORG_MEMBER["user"]]
+            + [specs["user"] for specs in api_test.USER_CRUD.values()]
         )
 
-        # prepare api test data
-        cls.prepare()
-
     def setUp(self):
         super().setUp()
 
         # db_user becomes the tester for user key
-        api_test_user = models.User.objects.get(username=USER["user"])
-        api_key, user_key = models.UserAPIKey.objects.create_key(
-            user=api_test_user, name="User api key"
-        )
-        self.db_user = self.rest_client(URL, verbose=VERBOSE, key=user_key, **USER)
+        self.db_user = self.rest_client(URL, verbose=VERBOSE, key=self.user_key, **USER)
 
         # db_org_admin becomes the tester for rw org api key
-        rw_org = models.Organization.objects.get(name="API Test Organization RW")
-        rw_api_key, rw_org_key = models.OrganizationAPIKey.objects.create_key(
-            name="test key", org=rw_org, email="test@localhost"
-        )
-
-        # Transfer group permissions to org key
-        for perm in rw_org.admin_usergroup.grainy_permissions.all():
-            rw_api_key.grainy_permissions.add_permission(
-                perm.namespace, perm.permission
-            )
-
         self.db_org_admin = self.rest_client(
-            URL, verbose=VERBOSE, key=rw_org_key, **USER_ORG_ADMIN
+            URL, verbose=VERBOSE, key=self.rw_org_key, **USER_ORG_ADMIN
         )
 
         # db_org_member becomes the tester for r org api key
-        r_org = models.Organization.objects.get(name="API Test Organization R")
-        r_api_key, r_org_key = models.OrganizationAPIKey.objects.create_key(
-            name="test key", org=r_org, email="test@localhost"
-        )
-
-        # Transfer group permissions to org key
-        for perm in r_org.usergroup.grainy_permissions.all():
-            r_api_key.grainy_permissions.add_permission(perm.namespace, perm.permission)
-
         self.db_org_member = self.rest_client(
-            URL, verbose=VERBOSE, key=r_org_key, **USER_ORG_MEMBER
+            URL, verbose=VERBOSE, key=self.r_org_key, **USER_ORG_MEMBER
         )
 
     # TESTS WE SKIP OR REWRITE IN API KEY CONTEXT
+    @pytest.mark.skip(reason="no org api key equivalent of an org-admin user")
     def test_org_member_001_POST_ix_with_perms(self):
         """
         We skip this test because there isn't an org admin key equivalent
@@ -259,8 +304,9 @@ class APITests(TestCase, api_test.TestJSON, api_test.Command):
         org_key, key = models.OrganizationAPIKey.objects.create_key(
             name="new key", org=org, email="test@localhost"
         )
-        for perm in org.admin_usergroup.grainy_permissions.all():
-            org_key.grainy_permissions.add_permission(perm.namespace, perm.permission)
+        models.OrganizationAPIPermission.objects.bulk_create(
+            org_key_permissions(org_key, org.admin_group_name)
+        )
         new_org_admin = self.rest_client(
             URL, verbose=VERBOSE, key=key, **USER_ORG_ADMIN
         )